@@ -1,18 +1,44 @@
 import os
+import math
 import alsaaudio
 import threading
+import queue
 import time
+import wave
 import logging
 from pathlib import Path
+from inotify_simple import INotify, flags
+
+# Frames per ALSA period; small enough for low start latency on a Pi
+PCM_PERIOD_SIZE = 1024
+
+# CPU core the playback thread is pinned to, when the board has it
+PLAYBACK_CPU = 3
+
+# SCHED_FIFO priority for the playback thread (needs CAP_SYS_NICE)
+PLAYBACK_RT_PRIORITY = 20
+
+# Seconds the volume level stays on the OLED after the last change
+VOLUME_DISPLAY_DURATION = 5.0
+
+# Minimum seconds between mixer writes while the encoder is turning
+VOLUME_APPLY_INTERVAL = 0.1
+
+# WAV sample width (bytes) -> ALSA sample format
+PCM_FORMATS = {
+    1: alsaaudio.PCM_FORMAT_U8,
+    2: alsaaudio.PCM_FORMAT_S16_LE,
+    3: alsaaudio.PCM_FORMAT_S24_3LE,
+    4: alsaaudio.PCM_FORMAT_S32_LE,
+}
 
 class AudioManager:
-    def __init__(self, audio_dir, mixer_device='Digital', mixer_control='PCM', oled_manager=None):
+    def __init__(self, audio_dir, mixer_device='Digital', mixer_control='PCM', oled_manager=None, pcm_device='default'):
         """Initialize the audio manager with ALSA mixer and sound directory."""
         self.logger = logging.getLogger(__name__)
         self.audio_dir = Path(audio_dir)
         self.oled_manager = oled_manager
-        self.volume_display_thread = None
-        self.previous_message = ""
+        self._running = True
         
         # Initialize ALSA mixer
         try:
@@ -33,31 +59,184 @@ class AudioManager:
         
         self.is_muted = False
         self._set_volume(self.current_volume)
+        # Encoder turns update the target; the main loop applies it, at most
+        # once per VOLUME_APPLY_INTERVAL
+        self._target_volume = self.current_volume
+        self._next_volume_write = 0.0
+        self._on_change = None
+        
+        # Decode every sound up front so playback never touches the disk
+        self._pcm_cache = {}
+        self._sounds_lock = threading.Lock()
+        for wav in self.audio_dir.glob("*.wav"):
+            self._load_sound(wav.name)
+        self._sounds = sorted(self._pcm_cache)
+        self.logger.debug(f"Found {len(self._sounds)} sound files")
+        
+        # Watch the audio directory so the cached sound list stays current
+        self._inotify = None
+        self._watch_thread = None
+        try:
+            self._inotify = INotify()
+            self._inotify.add_watch(
+                str(self.audio_dir),
+                flags.CLOSE_WRITE | flags.DELETE | flags.MOVED_TO | flags.MOVED_FROM
+            )
+            self._watch_thread = threading.Thread(target=self._watch_sounds, daemon=True)
+            self._watch_thread.start()
+        except OSError as e:
+            self.logger.warning(f"Could not watch audio directory {self.audio_dir}: {e}")
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+        
+        # PCM device is opened lazily by the playback thread
+        self.pcm_device = pcm_device
+        self._pcm = None
+        self._pcm_params = None
+        self._play_queue = queue.Queue()
+        self._playback_thread = threading.Thread(target=self._playback_loop, daemon=True)
+        self._playback_thread.start()
+        
+    def _load_sound(self, filename):
+        """Read a WAV file into the PCM cache.
+        
+        Args:
+            filename (str): Name of the WAV file in the audio directory"""
+        file_path = self.audio_dir / filename
+        try:
+            with wave.open(str(file_path), 'rb') as wf:
+                params = (wf.getnchannels(), wf.getframerate(), wf.getsampwidth())
+                if params[2] not in PCM_FORMATS:
+                    self.logger.warning(f"Unsupported sample width {params[2]} in {filename}")
+                    return
+                frames = wf.readframes(wf.getnframes())
+            # Split into whole periods up front, padding the tail with silence,
+            # so playback is just a sequence of full-period writes
+            chunk = PCM_PERIOD_SIZE * params[0] * params[2]
+            if len(frames) % chunk:
+                silence = b"\x80" if params[2] == 1 else b"\x00"
+                frames += silence * (chunk - len(frames) % chunk)
+            periods = [frames[offset:offset + chunk] for offset in range(0, len(frames), chunk)]
+            self._pcm_cache[filename] = (params, periods)
+            self.logger.debug(f"Cached sound {filename}: {params[0]}ch {params[1]}Hz")
+        except (OSError, EOFError, wave.Error) as e:
+            # wave.open raises EOFError on an empty file
+            self.logger.warning(f"Failed to load sound {filename}: {e}")
+            
+    def _watch_sounds(self):
+        """Background thread that updates the sound list and PCM cache
+        when WAV files are added to or removed from the audio directory."""
+        while self._running:
+            events = self._inotify.read(timeout=1000)
+            changed = False
+            for event in events:
+                if not event.name.endswith(".wav"):
+                    continue
+                changed = True
+                if event.mask & (flags.DELETE | flags.MOVED_FROM):
+                    self._pcm_cache.pop(event.name, None)
+                    self.logger.info(f"Sound removed: {event.name}")
+                else:
+                    try:
+                        self._load_sound(event.name)
+                    except Exception as e:
+                        # Keep watching; a later write of the file will retry it
+                        self.logger.error(f"Error loading sound {event.name}: {e}")
+                        continue
+                    self.logger.info(f"Sound added: {event.name}")
+            if changed:
+                with self._sounds_lock:
+                    self._sounds = sorted(self._pcm_cache)
+            
+    def _configure_pcm(self, params):
+        """Open the PCM device on first use and reconfigure it when the
+        sound format differs from the previous one.
+        
+        Args:
+            params (tuple): (channels, rate, sample width) of the sound"""
+        if self._pcm is None:
+            self._pcm = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, alsaaudio.PCM_NORMAL, device=self.pcm_device)
+            self.logger.info(f"Opened PCM playback device: {self.pcm_device}")
+        if params != self._pcm_params:
+            channels, rate, width = params
+            self._pcm.setchannels(channels)
+            self._pcm.setrate(rate)
+            self._pcm.setformat(PCM_FORMATS[width])
+            self._pcm.setperiodsize(PCM_PERIOD_SIZE)
+            self._pcm_params = params
+            
+    def _set_realtime(self):
+        """Pin the calling thread to PLAYBACK_CPU and switch it to SCHED_FIFO.
+        Either step is skipped when the core is missing or the process lacks
+        permission, e.g. on single-core boards or development machines."""
+        try:
+            if PLAYBACK_CPU in os.sched_getaffinity(0):
+                os.sched_setaffinity(0, {PLAYBACK_CPU})
+                self.logger.debug(f"Pinned playback thread to CPU {PLAYBACK_CPU}")
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Could not set playback thread affinity: {e}")
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(PLAYBACK_RT_PRIORITY))
+            self.logger.debug(f"Playback thread running SCHED_FIFO priority {PLAYBACK_RT_PRIORITY}")
+        except (AttributeError, OSError) as e:
+            self.logger.info(f"Could not raise playback thread priority: {e}")
+            
+    def _playback_loop(self):
+        """Background thread that writes queued sounds to the PCM device."""
+        self._set_realtime()
+        while True:
+            filename = self._play_queue.get()
+            if filename is None:
+                break
+            sound = self._pcm_cache.get(filename)
+            if sound is None:
+                continue
+            params, periods = sound
+            try:
+                self._configure_pcm(params)
+                for period in periods:
+                    # A newly queued sound interrupts the one playing
+                    if not self._play_queue.empty():
+                        self.logger.debug(f"Interrupted sound: {filename}")
+                        break
+                    self._pcm.write(period)
+            except alsaaudio.ALSAAudioError as e:
+                self.logger.error(f"Failed to play sound {filename}: {e}")
+                # Close the handle so an exclusive hw: device is free to reopen
+                if self._pcm is not None:
+                    try:
+                        self._pcm.close()
+                    except alsaaudio.ALSAAudioError:
+                        pass
+                self._pcm = None
+                self._pcm_params = None
         
     def play_sound(self, filename):
-        """Play a WAV file using aplay."""
+        """Queue a cached WAV file for playback. Returns immediately.
+        A sound that is still playing is cut off at the next period."""
         if self.is_muted:
             self.logger.info(f"Not playing sound {filename}: audio is muted")
             return
         
-        file_path = self.audio_dir / filename
-        if not file_path.exists():
-            self.logger.warning(f"Sound file not found: {file_path}")
+        if Path(filename).name != filename:
+            self.logger.warning(f"Refusing to play sound outside the audio directory: {filename}")
+            return
+            
+        if filename not in self._pcm_cache:
+            self.logger.warning(f"Sound file not found: {self.audio_dir / filename}")
             return
             
         self.logger.info(f"Playing sound: {filename}")
-        try:
-            exit_code = os.system(f"aplay {str(file_path)}")
-            if exit_code != 0:
-                self.logger.warning(f"aplay failed with exit code {exit_code} for file: {filename}")
-        except Exception as e:
-            self.logger.error(f"Failed to play sound {filename}: {e}")
+        self._play_queue.put(filename)
             
     def _display_volume_temporarily(self, message):
-        """Show volume information on the OLED display."""
+        """Show volume information on the OLED display. Each change restarts
+        the VOLUME_DISPLAY_DURATION timeout; once it expires the display
+        returns to whatever was showing before the first change."""
         if not self.oled_manager:
             return
-        self.oled_manager.show_centered_text("Volume Control", message, duration=5.0)
+        self.oled_manager.show_centered_text("Volume Control", message, duration=VOLUME_DISPLAY_DURATION)
             
     def adjust_volume(self, delta):
         """Adjust the system volume by a relative amount."""
@@ -65,12 +244,44 @@ class AudioManager:
             self.logger.info("Volume adjustment ignored: audio is muted")
             return
             
-        old_volume = self.current_volume
-        new_volume = max(0, min(100, self.current_volume + int(delta * 100)))
-        self._set_volume(new_volume)
-        self._display_volume_temporarily(f"Volume: {self.current_volume}%")
+        old_volume = self._target_volume
+        new_volume = max(0, min(100, self._target_volume + int(delta * 100)))
+        self._target_volume = new_volume
+        if self._on_change:
+            self._on_change()
+        self._display_volume_temporarily(f"Volume: {new_volume}%")
         self.logger.info(f"Volume adjusted: {old_volume}% -> {new_volume}%")
         
+    def set_change_callback(self, callback):
+        """Register a function to call when a volume change is waiting to be
+        applied.
+        
+        Args:
+            callback (callable): Called with no arguments, from the encoder thread"""
+        self._on_change = callback
+        
+    @property
+    def next_deadline(self):
+        """float: time.monotonic() value at which apply_pending_volume next
+        has a write to make, or infinity if none is pending."""
+        if self._target_volume == self.current_volume:
+            return math.inf
+        return self._next_volume_write
+        
+    def apply_pending_volume(self):
+        """Write the latest requested volume to the ALSA mixer. Called from
+        the main loop whenever it wakes; writes are spaced at least
+        VOLUME_APPLY_INTERVAL apart, so a fast encoder turn costs one mixer
+        write per interval however many detents it produced. A write held
+        back by the limit is due at next_deadline."""
+        if self._target_volume == self.current_volume:
+            return
+        now = time.monotonic()
+        if now < self._next_volume_write:
+            return
+        self._next_volume_write = now + VOLUME_APPLY_INTERVAL
+        self._set_volume(self._target_volume)
+        
     def toggle_mute(self):
         """Toggle the audio mute state."""
         self.is_muted = not self.is_muted
@@ -81,7 +292,7 @@ class AudioManager:
                 self.logger.info("Audio muted")
             else:
                 self.mixer.setmute(0)
-                self._display_volume_temporarily(f"Volume: {self.current_volume}%")
+                self._display_volume_temporarily(f"Volume: {self._target_volume}%")
                 self.logger.info("Audio unmuted")
         except alsaaudio.ALSAAudioError as e:
             self.logger.error(f"Failed to {('mute' if self.is_muted else 'unmute')} audio: {e}")
@@ -95,14 +306,43 @@ class AudioManager:
         except alsaaudio.ALSAAudioError as e:
             self.logger.error(f"Failed to set volume to {volume}%: {e}")
         
+    def mixer_poll_fds(self):
+        """Get the ALSA mixer file descriptors that signal volume changes.
+        
+        Returns:
+            list: (fd, eventmask) tuples to register with the main loop"""
+        return self.mixer.polldescriptors()
+        
+    def handle_mixer_events(self):
+        """Process pending mixer events. Called from the main loop when a
+        mixer fd is readable; picks up volume changes made outside this
+        program and shows them on the OLED display."""
+        try:
+            self.mixer.handleevents()
+            volume = self.mixer.getvolume()[0]
+        except alsaaudio.ALSAAudioError as e:
+            self.logger.error(f"Failed to read mixer events: {e}")
+            return
+        if volume != self.current_volume:
+            self.logger.info(f"Volume changed externally: {self.current_volume}% -> {volume}%")
+            self.current_volume = volume
+            self._target_volume = volume
+            self._display_volume_temporarily(f"Volume: {volume}%")
+        
     def get_available_sounds(self):
-        """Get a list of WAV files in the audio directory."""
-        sounds = [f.name for f in self.audio_dir.glob("*.wav")]
-        self.logger.debug(f"Found {len(sounds)} sound files")
-        return sounds
+        """Get the sorted list of WAV files in the audio directory."""
+        with self._sounds_lock:
+            return self._sounds
         
     def cleanup(self):
         """Clean up resources."""
-        if self.volume_display_thread and self.volume_display_thread.is_alive():
-            self.volume_display_thread.cancel()
-            self.logger.debug("Cleaned up volume display thread")
\ No newline at end of file
+        self._running = False
+        if self._watch_thread:
+            self._watch_thread.join(timeout=2.0)
+            self._inotify.close()
+        self._play_queue.put(None)
+        self._playback_thread.join(timeout=1.0)
+        if self._pcm is not None:
+            self._pcm.close()
+            self._pcm = None
+            self.logger.debug("Closed PCM playback device")
\ No newline at end of file
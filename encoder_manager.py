@@ -1,65 +1,131 @@
-import RPi.GPIO as GPIO
+import gpiod
+import os
+import select
+import threading
 import logging
 from pathlib import Path
 
+# Quadrature transition table indexed by (previous_state << 2) | current_state,
+# where a state is (clk << 1) | dt. Valid single-step transitions yield +1
+# (clockwise) or -1 (counter-clockwise); no-change and invalid jumps yield 0.
+_ENC_TABLE = (
+    0, -1, 1, 0,
+    1, 0, 0, -1,
+    -1, 0, 0, 1,
+    0, 1, -1, 0,
+)
+
+# Transitions per mechanical detent (one full quadrature cycle)
+_ENC_STEPS_PER_DETENT = 4
+
+# GPIO character device holding the BCM-numbered header pins
+GPIO_CHIP = "gpiochip0"
+
+# Consumer label shown for our lines in gpioinfo
+GPIO_CONSUMER = "chimellm"
+
+# Minimum seconds between accepted button presses
+BUTTON_BOUNCE_TIME = 0.3
+
 class RotaryEncoder:
-    def __init__(self, clk_pin, dt_pin, sw_pin):
-        """Initialize a rotary encoder with GPIO pins.
+    def __init__(self, chip, clk_pin, dt_pin, sw_pin):
+        """Initialize a rotary encoder on GPIO character-device lines.
         
         Args:
-            clk_pin (int): GPIO pin number for the clock signal
-            dt_pin (int): GPIO pin number for the data signal
-            sw_pin (int): GPIO pin number for the switch/button"""
+            chip (gpiod.Chip): Open GPIO chip the pins belong to
+            clk_pin (int): GPIO line offset for the clock signal
+            dt_pin (int): GPIO line offset for the data signal
+            sw_pin (int): GPIO line offset for the switch/button"""
         self.logger = logging.getLogger(__name__)
         self.clk_pin = clk_pin
         self.dt_pin = dt_pin
         self.sw_pin = sw_pin
-        self.clk_last_state = None
+        self._state = 0
+        self._accum = 0
+        self._last_press = 0.0
         self.callback_cw = None
         self.callback_ccw = None
         self.callback_button = None
         
         try:
-            GPIO.setup(clk_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-            GPIO.setup(dt_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-            GPIO.setup(sw_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            self.lines = chip.get_lines([clk_pin, dt_pin, sw_pin])
+            self.lines.request(
+                consumer=GPIO_CONSUMER,
+                type=gpiod.LINE_REQ_EV_BOTH_EDGES,
+                flags=gpiod.LINE_REQ_FLAG_BIAS_PULL_UP
+            )
             self.logger.info(f"Initialized rotary encoder on pins CLK:{clk_pin}, DT:{dt_pin}, SW:{sw_pin}")
         except Exception as e:
-            self.logger.error(f"Failed to setup GPIO pins for rotary encoder: {e}")
+            self.logger.error(f"Failed to request GPIO lines for rotary encoder: {e}")
             raise
         
-        self.clk_last_state = GPIO.input(clk_pin)
+        clk, dt, _ = self.lines.get_values()
+        self._state = (clk << 1) | dt
+        
+        self._clk_line, self._dt_line, self._sw_line = self.lines.to_list()
         
-        GPIO.add_event_detect(clk_pin, GPIO.BOTH, callback=self._rotation_callback)
-        GPIO.add_event_detect(sw_pin, GPIO.FALLING, callback=self._button_callback, bouncetime=300)
+    def event_lines(self):
+        """Get the lines this encoder listens on, tagged with their role.
         
-    def _rotation_callback(self, channel):
+        Returns:
+            tuple: ((role, gpiod.Line), ...) for the clock, data and switch lines"""
+        return (("clk", self._clk_line), ("dt", self._dt_line), ("sw", self._sw_line))
+        
+    def handle(self, role, event):
+        """Dispatch an edge event read from one of this encoder's lines.
+        
+        Args:
+            role (str): Role of the line the event came from ("clk", "dt" or "sw")
+            event (gpiod.LineEvent): Edge event read from the line"""
+        if role == "sw":
+            self._button_callback(event)
+        else:
+            self._rotation_callback(role, event)
+            
+    def _rotation_callback(self, role, event):
         """Internal callback for handling rotary encoder rotation events.
-        Called when the clock pin state changes. Determines rotation direction
-        by comparing clock and data pin states.
+        Called when either the clock or data line changes state. Decodes the
+        quadrature sequence with a transition table and reports one step per
+        full detent, which rejects contact bounce and invalid transitions.
         
         Args:
-            channel (int): GPIO channel that triggered the event
+            role (str): "clk" or "dt", the line that changed
+            event (gpiod.LineEvent): Edge event from that line
         
         Note:
             Calls self.callback_cw for clockwise rotation
             Calls self.callback_ccw for counter-clockwise rotation"""
-        clk_state = GPIO.input(self.clk_pin)
-        dt_state = GPIO.input(self.dt_pin)
-        
-        if clk_state != self.clk_last_state:
-            if dt_state != clk_state:
-                if self.callback_cw:
-                    self.logger.debug(f"Encoder {self.clk_pin} rotated clockwise")
-                    self.callback_cw()
-            else:
-                if self.callback_ccw:
-                    self.logger.debug(f"Encoder {self.clk_pin} rotated counter-clockwise")
-                    self.callback_ccw()
-                    
-        self.clk_last_state = clk_state
+        level = 1 if event.type == gpiod.LineEvent.RISING_EDGE else 0
+        if role == "clk":
+            state = (level << 1) | (self._state & 1)
+        else:
+            state = (self._state & 2) | level
+        self._accum += _ENC_TABLE[(self._state << 2) | state]
+        self._state = state
+        
+        if self._accum >= _ENC_STEPS_PER_DETENT:
+            self._accum = 0
+            if self.callback_cw:
+                self.logger.debug(f"Encoder {self.clk_pin} rotated clockwise")
+                self.callback_cw()
+        elif self._accum <= -_ENC_STEPS_PER_DETENT:
+            self._accum = 0
+            if self.callback_ccw:
+                self.logger.debug(f"Encoder {self.clk_pin} rotated counter-clockwise")
+                self.callback_ccw()
         
-    def _button_callback(self, channel):
+    def _button_callback(self, event):
+        """Internal callback for button line events. Acts on falling edges
+        (pressed, with pull-up) and ignores bounces within BUTTON_BOUNCE_TIME.
+        
+        Args:
+            event (gpiod.LineEvent): Edge event from the switch line"""
+        if event.type != gpiod.LineEvent.FALLING_EDGE:
+            return
+        timestamp = event.sec + event.nsec / 1e9
+        if timestamp - self._last_press < BUTTON_BOUNCE_TIME:
+            return
+        self._last_press = timestamp
         if self.callback_button:
             self.logger.debug(f"Encoder {self.sw_pin} button pressed")
             self.callback_button()
@@ -75,11 +141,15 @@ class RotaryEncoder:
         self.callback_ccw = callback_ccw
         self.callback_button = callback_button
         self.logger.debug("Encoder callbacks configured")
+        
+    def close(self):
+        """Release the GPIO lines."""
+        self.lines.release()
 
 class EncoderManager:
     def __init__(self, volume_pins, sound_select_pins):
         """Initialize manager for multiple rotary encoders.
-        Sets up GPIO mode and initializes encoders for volume and sound selection.
+        Opens the GPIO chip and initializes encoders for volume and sound selection.
         
         Args:
             volume_pins (tuple): Tuple of (clk, dt, sw) pins for volume encoder
@@ -91,25 +161,82 @@ class EncoderManager:
         self.logger.info("Initializing encoder manager")
         
         try:
-            GPIO.setmode(GPIO.BCM)
-            self.logger.debug("Set GPIO mode to BCM")
+            self.chip = gpiod.Chip(GPIO_CHIP)
+            self.logger.debug(f"Opened GPIO chip {GPIO_CHIP}")
         except Exception as e:
-            self.logger.error(f"Failed to set GPIO mode: {e}")
+            self.logger.error(f"Failed to open GPIO chip {GPIO_CHIP}: {e}")
             raise
         
         try:
             # Volume encoder
-            self.volume_encoder = RotaryEncoder(*volume_pins)
+            self.volume_encoder = RotaryEncoder(self.chip, *volume_pins)
             self.logger.info("Volume encoder initialized")
             
             # Sound selection encoder
-            self.sound_select_encoder = RotaryEncoder(*sound_select_pins)
+            self.sound_select_encoder = RotaryEncoder(self.chip, *sound_select_pins)
             self.logger.info("Sound selection encoder initialized")
         except Exception as e:
             self.logger.error(f"Failed to initialize encoders: {e}")
-            GPIO.cleanup()
+            self.chip.close()
             raise
         
+        # One epoll thread serves every encoder line; the pipe wakes it for shutdown
+        self._stop_r, self._stop_w = os.pipe()
+        self._epoll = select.epoll()
+        self._epoll.register(self._stop_r, select.EPOLLIN)
+        self._fd_to_handler = {}
+        for encoder in (self.volume_encoder, self.sound_select_encoder):
+            for role, line in encoder.event_lines():
+                fd = line.event_get_fd()
+                self._epoll.register(fd, select.EPOLLIN | select.EPOLLPRI)
+                self._fd_to_handler[fd] = (encoder, line, role)
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._event_loop, daemon=True)
+        self._thread.start()
+        
+    def _event_loop(self):
+        """Background thread that waits for line events on all encoders and
+        hands each one to the encoder that owns the line.
+        
+        Clock and data edges arrive on separate fds, so every queued event on
+        the ready lines is read and each encoder's edges are decoded in
+        timestamp order; the quadrature table depends on seeing them in the
+        order they happened."""
+        while self._running:
+            rotations = {}
+            for fd, _ in self._epoll.poll():
+                if fd == self._stop_r:
+                    return
+                encoder, line, role = self._fd_to_handler[fd]
+                try:
+                    events = line.event_read_multiple()
+                except Exception as e:
+                    self.logger.error(f"Error reading events on pin {line.offset()}: {e}")
+                    continue
+                if role == "sw":
+                    for event in events:
+                        self._dispatch(encoder, line, role, event)
+                else:
+                    rotations.setdefault(encoder, []).extend((event, line, role) for event in events)
+            for encoder, edges in rotations.items():
+                edges.sort(key=lambda edge: (edge[0].sec, edge[0].nsec))
+                for event, line, role in edges:
+                    self._dispatch(encoder, line, role, event)
+                    
+    def _dispatch(self, encoder, line, role, event):
+        """Hand one line event to its encoder, logging any handler error.
+        
+        Args:
+            encoder (RotaryEncoder): Encoder that owns the line
+            line (gpiod.Line): Line the event was read from
+            role (str): Role of the line ("clk", "dt" or "sw")
+            event (gpiod.LineEvent): Edge event read from the line"""
+        try:
+            encoder.handle(role, event)
+        except Exception as e:
+            self.logger.error(f"Error handling event on pin {line.offset()}: {e}")
+        
     def setup_volume_callbacks(self, volume_up, volume_down, volume_mute):
         """Configure callbacks for the volume control encoder.
         
@@ -148,7 +275,15 @@ class EncoderManager:
         """Clean up GPIO resources.
         Should be called when shutting down to release GPIO pins."""
         try:
-            GPIO.cleanup()
+            self._running = False
+            os.write(self._stop_w, b"\0")
+            self._thread.join(timeout=1.0)
+            self._epoll.close()
+            os.close(self._stop_r)
+            os.close(self._stop_w)
+            self.volume_encoder.close()
+            self.sound_select_encoder.close()
+            self.chip.close()
             self.logger.info("GPIO resources cleaned up")
         except Exception as e:
             self.logger.error(f"Error during GPIO cleanup: {e}")
\ No newline at end of file
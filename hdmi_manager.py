@@ -1,17 +1,38 @@
 import vlc
 import time
 import logging
+import threading
 from pathlib import Path
 from vcgencmd import Vcgencmd
 
+# Seconds the display needs after power-on before video output is visible
+DISPLAY_POWER_ON_DELAY = 1.0
+
+# Player states in which a stream is still running or about to
+PLAYER_ACTIVE_STATES = (vlc.State.Opening, vlc.State.Buffering, vlc.State.Playing)
+
 class HDMIManager:
     def __init__(self, framebuffer):
         """Initialize HDMI display manager."""
         self.logger = logging.getLogger(__name__)
         self.framebuffer = framebuffer
-        self.player = None
         self.is_display_on = False
+        self.is_playing = False
+        self.current_url = None
+        self._display_ready_at = 0.0
+        self._prewarmed = None  # (url, vlc.Media) prepared ahead of playback
         self.vcgencmd = Vcgencmd()
+        
+        # Create the VLC instance once; plugin loading is slow on a Pi
+        self._vlc = vlc.Instance(['--vout=fb', f'--fbdev={framebuffer}', '--no-audio', '--quiet'])
+        if self._vlc is None:
+            # libvlc_new refuses unknown options or missing plugins by returning NULL
+            self.logger.error(f"Failed to create VLC instance for framebuffer {framebuffer}")
+            raise RuntimeError("Could not initialize libvlc")
+        self.player = self._vlc.media_player_new()
+        self.player.event_manager().event_attach(
+            vlc.EventType.MediaPlayerEncounteredError, self._on_player_error
+        )
         self.logger.info(f"Initialized HDMI manager with framebuffer: {framebuffer}")
         
     def turn_on_display(self):
@@ -20,7 +41,8 @@ class HDMIManager:
             try:
                 self.vcgencmd.display_power(1)
                 self.is_display_on = True
-                time.sleep(1)  # Wait for display to initialize
+                # Don't block here; play_video waits out whatever remains
+                self._display_ready_at = time.monotonic() + DISPLAY_POWER_ON_DELAY
                 self.logger.info("HDMI display enabled")
             except Exception as e:
                 self.logger.error(f"Failed to enable HDMI display: {e}")
@@ -28,7 +50,7 @@ class HDMIManager:
     def turn_off_display(self):
         """Disable the HDMI display."""
         if self.is_display_on:
-            if self.player:
+            if self.is_playing:
                 self.stop_video()
             try:
                 self.vcgencmd.display_power(0)
@@ -42,35 +64,72 @@ class HDMIManager:
         self.logger.info(f"Attempting to play video from: {url}")
         self.turn_on_display()
         
-        if self.player:
+        if self.is_playing:
+            # is_playing stays set when a stream ends or drops on its own,
+            # so ask the player whether it's really still running
+            if url == self.current_url and self.player.get_state() in PLAYER_ACTIVE_STATES:
+                self.logger.debug("Video stream already playing")
+                return
             self.stop_video()
             
         try:
-            instance = vlc.Instance()
-            self.player = instance.media_player_new()
-            media = instance.media_new(url)
-            self.player.set_media(media)
-            
-            # Configure VLC for framebuffer output
-            self.player.set_mrl("--vout=fb")
-            self.player.set_options(f"--fb-device={self.framebuffer}")
-                
+            self.player.set_media(self._take_media(url))
+            self.current_url = url
+            remaining = self._display_ready_at - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)  # Wait for display to initialize
             self.player.play()
-            time.sleep(1)  # Give VLC a moment to start
-            
-            if self.player.get_state() == vlc.State.Error:
-                self.logger.warning(f"Failed to play video stream: {url}")
-                self.turn_off_display()
-            else:
-                self.logger.info("Video playback started successfully")
+            self.is_playing = True
+            self.logger.info("Video playback started")
                 
         except Exception as e:
             self.logger.warning(f"Error setting up video playback: {e}")
             self.turn_off_display()
         
+    def prewarm(self, url):
+        """Prepare media for a stream that is likely to be played soon.
+        Starts an asynchronous network parse so a following play_video
+        for the same URL skips the stream probe.
+        
+        Args:
+            url (str): Video stream URL to prepare"""
+        if self._prewarmed and self._prewarmed[0] == url:
+            return
+        try:
+            media = self._vlc.media_new(url)
+            media.parse_with_options(vlc.MediaParseFlag.network, 0)
+            self._prewarmed = (url, media)
+            self.logger.debug(f"Prewarmed video stream: {url}")
+        except Exception as e:
+            self.logger.warning(f"Failed to prewarm video stream {url}: {e}")
+            
+    def _take_media(self, url):
+        """Get media for a URL, reusing prewarmed media when it matches.
+        
+        Args:
+            url (str): Video stream URL
+            
+        Returns:
+            vlc.Media: Media ready to hand to the player"""
+        if self._prewarmed and self._prewarmed[0] == url:
+            media = self._prewarmed[1]
+            self._prewarmed = None
+            return media
+        return self._vlc.media_new(url)
+        
+    def _on_player_error(self, event):
+        """VLC event callback for playback errors.
+        
+        Args:
+            event (vlc.Event): Error event from the media player"""
+        self.logger.warning("Failed to play video stream")
+        # libvlc must not be called back from its own event thread
+        threading.Thread(target=self.turn_off_display, daemon=True).start()
+        
     def stop_video(self):
         """Stop the currently playing video."""
-        if self.player:
+        if self.is_playing:
             self.player.stop()
-            self.player = None
+            self.is_playing = False
+            self.current_url = None
             self.logger.info("Video playback stopped")
\ No newline at end of file
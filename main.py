@@ -1,11 +1,19 @@
 import os
-import json
 import time
-import yaml
+import uuid
+import queue
+import pickle
+import socket
+import sys
+import functools
+import selectors
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-import paho.mqtt.client as mqtt
+from typing import Optional
+
+import msgspec
 
 from audio_manager import AudioManager
 from hdmi_manager import HDMIManager
@@ -13,6 +21,124 @@ from oled_manager import OLEDManager
 from encoder_manager import EncoderManager
 from shairport_manager import ShairportManager
 
+# Longest sleep between OLED refreshes when idle; state changes wake the loop
+# immediately and clock/motion rollovers are scheduled, so this is a backstop
+DISPLAY_IDLE_INTERVAL = 1.0
+
+# CPU core the MQTT network thread is pinned to, when the board has it
+MQTT_CPU = 1
+
+# Nice value for the main loop thread, so it yields to MQTT handling. Besides
+# rendering the OLED it reads Shairport metadata and mixer events and applies
+# volume changes; all of that is light and tolerates a little scheduling delay
+DISPLAY_NICE = 5
+
+# MQTT messages waiting for the event worker before new ones are dropped
+MQTT_EVENT_QUEUE_SIZE = 256
+
+class EventPayload(msgspec.Struct):
+    """Doorbell and motion event payload, validated while decoding."""
+    active: bool
+    timestamp: str
+    video_url: Optional[str]
+
+class MqttTopics(msgspec.Struct):
+    """MQTT topics subscribed to and published on."""
+    doorbell: str
+    motion: str
+    message: str
+    status: Optional[str] = None
+
+class MqttConfig(msgspec.Struct):
+    """MQTT broker connection settings."""
+    broker: str
+    port: int
+    topics: MqttTopics
+    username: Optional[str] = None
+    password: Optional[str] = None
+    client_id: Optional[str] = None
+
+class MixerConfig(msgspec.Struct):
+    """ALSA mixer used for volume control."""
+    device: str
+    control: str
+
+class AudioConfig(msgspec.Struct):
+    """Doorbell sound playback settings."""
+    directory: str
+    default_sound: str
+    mixer: MixerConfig
+    pcm_device: str = 'default'
+
+class VideoConfig(msgspec.Struct):
+    """Camera stream settings."""
+    default_stream: str
+
+class HdmiConfig(msgspec.Struct):
+    """HDMI output settings."""
+    framebuffer: str
+
+class OledConfig(msgspec.Struct):
+    """OLED panel bus settings."""
+    i2c_port: int
+    i2c_address: int
+
+class DisplaysConfig(msgspec.Struct):
+    """Display settings."""
+    hdmi: HdmiConfig
+    oled: OledConfig
+
+class EncoderPins(msgspec.Struct):
+    """GPIO line offsets for one rotary encoder."""
+    clk: int
+    dt: int
+    sw: int
+
+class GpioConfig(msgspec.Struct):
+    """Rotary encoder wiring."""
+    volume_encoder: EncoderPins
+    sound_select_encoder: EncoderPins
+
+class ShairportConfig(msgspec.Struct):
+    """AirPlay metadata display settings."""
+    metadata_pipe: str
+    show_duration: float
+
+class Config(msgspec.Struct):
+    """Top-level config.yaml layout, validated at load time."""
+    mqtt: MqttConfig
+    audio: AudioConfig
+    video: VideoConfig
+    displays: DisplaysConfig
+    gpio: GpioConfig
+    shairport: ShairportConfig
+
+@functools.lru_cache(maxsize=128)
+def _parse_iso(timestamp):
+    """Parse an ISO8601 timestamp. Memoized because bursts of events often
+    carry the same timestamp."""
+    return datetime.fromisoformat(timestamp)
+
+# Reusable decoders for MQTT payloads
+_event_decoder = msgspec.json.Decoder(EventPayload)
+_json_decoder = msgspec.json.Decoder()
+
+# Configuration file and the pickled parse cache kept next to it
+CONFIG_PATH = 'config.yaml'
+CONFIG_CACHE_PATH = 'config.yaml.cache'
+
+# File holding the generated MQTT client id, reused across restarts so the
+# broker can resume our persistent session
+MQTT_CLIENT_ID_FILE = '.mqtt_client_id'
+
+# QoS 1/2 messages allowed in flight at once, and queued behind them
+MQTT_MAX_INFLIGHT = 100
+MQTT_MAX_QUEUED = 1000
+
+# Bounds in seconds for the client's exponential reconnect backoff
+MQTT_RECONNECT_MIN_DELAY = 1
+MQTT_RECONNECT_MAX_DELAY = 30
+
 class DoorbellSystem:
     """Main system controller for the smart doorbell.
     
@@ -30,52 +156,98 @@ class DoorbellSystem:
         self.logger.info("Initializing doorbell system")
         
         try:
-            with open('config.yaml', 'r') as f:
-                self.config = yaml.safe_load(f)
-                self.logger.info("Configuration loaded successfully")
+            self.config = self._load_config()
+            self.logger.info("Configuration loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
             raise
         
+        # Values used on every MQTT event, looked up once. Topics are interned
+        # so handlers can compare an interned incoming topic by identity
+        topics = self.config.mqtt.topics
+        self._topic_doorbell = sys.intern(topics.doorbell)
+        self._topic_motion = sys.intern(topics.motion)
+        self._topic_message = sys.intern(topics.message)
+        self._topic_status = topics.status
+        self._default_stream = self.config.video.default_stream
+        self._default_sound = self.config.audio.default_sound
+        
+        # MQTT topic -> (decode(topic, raw), handler(topic, payload)), built
+        # once for on_message
+        self._topic_handlers = {
+            self._topic_doorbell: (self._decode_event, self.handle_event_message),
+            self._topic_motion: (self._decode_event, self.handle_event_message),
+            self._topic_message: (self._decode_message, lambda topic, payload: self.handle_message(payload)),
+        }
+        
+        # on_message only queues (topic, raw payload); a worker thread decodes
+        # and handles them so slow video/audio calls never stall paho's network loop
+        self._event_q = queue.Queue(maxsize=MQTT_EVENT_QUEUE_SIZE)
+        self._event_thread = threading.Thread(target=self._event_worker, daemon=True)
+        
+        # Main loop waits on a selector; the self-pipe lets other threads wake it
+        self._running = False
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, self._drain_wakeups)
+        
         try:
             # Initialize components
             self.logger.info("Initializing system components")
             
             self.oled = OLEDManager(
-                self.config['displays']['oled']['i2c_port'],
-                self.config['displays']['oled']['i2c_address']
+                self.config.displays.oled.i2c_port,
+                self.config.displays.oled.i2c_address
             )
+            self.oled.set_change_callback(self.wake)
             
             self.audio = AudioManager(
-                self.config['audio']['directory'],
-                mixer_device=self.config['audio']['mixer']['device'],
-                mixer_control=self.config['audio']['mixer']['control'],
-                oled_manager=self.oled
+                self.config.audio.directory,
+                mixer_device=self.config.audio.mixer.device,
+                mixer_control=self.config.audio.mixer.control,
+                oled_manager=self.oled,
+                pcm_device=self.config.audio.pcm_device
             )
+            self.audio.set_change_callback(self.wake)
             
-            self.hdmi = HDMIManager(self.config['displays']['hdmi']['framebuffer'])
+            # Wake the main loop on mixer changes instead of polling the volume
+            for fd, _ in self.audio.mixer_poll_fds():
+                self._selector.register(fd, selectors.EVENT_READ, self.audio.handle_mixer_events)
+            
+            self.hdmi = HDMIManager(self.config.displays.hdmi.framebuffer)
             
             self.shairport = ShairportManager(
-                self.config['shairport']['metadata_pipe'],
+                self.config.shairport.metadata_pipe,
                 oled_manager=self.oled,
-                show_duration=self.config['shairport']['show_duration']
+                show_duration=self.config.shairport.show_duration
             )
             
             self.encoders = EncoderManager(
                 volume_pins=(
-                    self.config['gpio']['volume_encoder']['clk'],
-                    self.config['gpio']['volume_encoder']['dt'],
-                    self.config['gpio']['volume_encoder']['sw']
+                    self.config.gpio.volume_encoder.clk,
+                    self.config.gpio.volume_encoder.dt,
+                    self.config.gpio.volume_encoder.sw
                 ),
                 sound_select_pins=(
-                    self.config['gpio']['sound_select_encoder']['clk'],
-                    self.config['gpio']['sound_select_encoder']['dt'],
-                    self.config['gpio']['sound_select_encoder']['sw']
+                    self.config.gpio.sound_select_encoder.clk,
+                    self.config.gpio.sound_select_encoder.dt,
+                    self.config.gpio.sound_select_encoder.sw
                 )
             )
             
             # Setup MQTT client with logging callbacks
-            self.mqtt_client = mqtt.Client()
+            # A stable client id with clean_session=False lets the broker keep
+            # our subscriptions and queue QoS 1 messages while we are offline
+            import paho.mqtt.client as mqtt
+            self.mqtt_client = mqtt.Client(client_id=self._persisted_client_id(), clean_session=False)
+            self.mqtt_client.max_inflight_messages_set(MQTT_MAX_INFLIGHT)
+            self.mqtt_client.max_queued_messages_set(MQTT_MAX_QUEUED)
+            self.mqtt_client.reconnect_delay_set(min_delay=MQTT_RECONNECT_MIN_DELAY,
+                                                 max_delay=MQTT_RECONNECT_MAX_DELAY)
+            if self._topic_status:
+                self.mqtt_client.will_set(self._topic_status, "offline", qos=1, retain=True)
             self.mqtt_client.on_connect = self.on_connect
             self.mqtt_client.on_message = self.on_message
             self.mqtt_client.on_disconnect = self.on_disconnect
@@ -83,7 +255,6 @@ class DoorbellSystem:
             # Initialize state
             self.current_sound_index = 0
             self.selected_sound_index = 0
-            self.available_sounds = self.audio.get_available_sounds()
             if not self.available_sounds:
                 self.logger.warning("No sound files found in audio directory")
             
@@ -96,6 +267,77 @@ class DoorbellSystem:
             self.cleanup()
             raise
         
+    def _load_config(self):
+        """Load and validate config.yaml.
+        
+        Returns:
+            Config: Parsed configuration
+            
+        Raises:
+            msgspec.ValidationError: If the file doesn't match the Config layout"""
+        return msgspec.convert(self._load_raw_config(), Config)
+        
+    def _load_raw_config(self):
+        """Load config.yaml, reusing the pickled parse from CONFIG_CACHE_PATH
+        when it was made from the same version of the file.
+        
+        Returns:
+            dict: Parsed configuration"""
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+        try:
+            with open(CONFIG_CACHE_PATH, 'rb') as f:
+                cached_mtime, config = pickle.load(f)
+            if cached_mtime == mtime:
+                self.logger.debug("Using cached configuration")
+                return config
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable configuration cache: {e}")
+            
+        # Only a cache miss needs the YAML parser, so import it here
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:
+            from yaml import SafeLoader
+        
+        with open(CONFIG_PATH, 'r') as f:
+            config = yaml.load(f, Loader=SafeLoader)
+        try:
+            with open(CONFIG_CACHE_PATH, 'wb') as f:
+                pickle.dump((mtime, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            self.logger.warning(f"Could not write configuration cache: {e}")
+        return config
+        
+    def _persisted_client_id(self):
+        """Get the MQTT client id, generating and saving one on first run.
+        
+        Returns:
+            str: mqtt.client_id from the config if set, otherwise the id
+                stored in MQTT_CLIENT_ID_FILE"""
+        client_id = self.config.mqtt.client_id
+        if client_id:
+            return client_id
+        path = Path(MQTT_CLIENT_ID_FILE)
+        try:
+            client_id = path.read_text().strip()
+        except FileNotFoundError:
+            client_id = ""
+        if not client_id:
+            client_id = f"chimellm-{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+            try:
+                path.write_text(client_id)
+            except OSError as e:
+                self.logger.warning(f"Could not save MQTT client id: {e}")
+        return client_id
+        
+    @property
+    def available_sounds(self):
+        """Sorted list of doorbell sounds, kept current by the audio manager."""
+        return self.audio.get_available_sounds()
+        
     def toggle_display(self):
         """Toggle the HDMI display on/off.
         When turning on, automatically starts playing the default video stream."""
@@ -105,7 +347,7 @@ class DoorbellSystem:
         else:
             self.logger.info("Turning on HDMI display and starting video stream")
             self.hdmi.turn_on_display()
-            self.hdmi.play_video(self.config['video']['default_stream'])
+            self.hdmi.play_video(self._default_stream)
             
     def setup_encoder_callbacks(self):
         """Configure the rotary encoder callbacks for system control.
@@ -160,12 +402,12 @@ class DoorbellSystem:
             self.logger.warning("Cannot play sound: no sounds available")
             return
             
-        self.current_sound_index = self.selected_sound_index
+        self.current_sound_index = self.selected_sound_index % len(self.available_sounds)
         filename = self.available_sounds[self.current_sound_index]
         self.logger.info(f"Playing selected sound: {filename}")
-        self.hdmi.turn_on_display()
         self.audio.play_sound(filename)
-        self.hdmi.play_video(self.config['video']['default_stream'])
+        self.hdmi.turn_on_display()
+        self.hdmi.play_video(self._default_stream)
             
     def on_connect(self, client, userdata, flags, rc):
         """MQTT connection callback.
@@ -183,10 +425,16 @@ class DoorbellSystem:
                 5: Connection refused - not authorized"""
         if rc == 0:
             self.logger.info("Connected to MQTT broker")
+            if self._topic_status:
+                client.publish(self._topic_status, "online", qos=1, retain=True)
+            if flags.get('session present'):
+                self.logger.info("Resumed persistent MQTT session")
+            # Subscribe even on a resumed session: the configured topics may
+            # have changed since it was created, and resubscribing is harmless
             topics = [
-                (self.config['mqtt']['topics']['doorbell'], 0),
-                (self.config['mqtt']['topics']['motion'], 0),
-                (self.config['mqtt']['topics']['message'], 0)
+                (self._topic_doorbell, 1),
+                (self._topic_motion, 1),
+                (self._topic_message, 1)
             ]
             client.subscribe(topics)
             self.logger.info(f"Subscribed to topics: {[t[0] for t in topics]}")
@@ -212,11 +460,10 @@ class DoorbellSystem:
         
         Args:
             topic (str): MQTT topic that received the message
-            payload (dict): Message payload containing event data
-                Required fields:
+            payload (EventPayload): Decoded event data
                 - active (bool): Whether the event is active
                 - timestamp (str): ISO8601 timestamp of the event
-                - video_url (str): URL of the video stream to display
+                - video_url (str or None): URL of the video stream to display
                 
         Note:
             - Displays appropriate message on OLED
@@ -224,41 +471,35 @@ class DoorbellSystem:
             - Plays doorbell sound for doorbell events
             - Updates motion status display"""
         try:
-            if not isinstance(payload, dict):
-                self.logger.warning(f"Invalid payload format on {topic}: expected dict, got {type(payload)}")
-                return
-                
-            missing_fields = [f for f in ['active', 'timestamp', 'video_url'] if f not in payload]
-            if missing_fields:
-                self.logger.warning(f"Missing required fields in {topic} payload: {missing_fields}")
-                return
-                
             try:
-                event_time = datetime.fromisoformat(payload['timestamp'])
-            except (ValueError, TypeError) as e:
-                self.logger.warning(f"Invalid timestamp format in {topic} payload: {payload['timestamp']}")
+                event_time = _parse_iso(payload.timestamp)
+            except ValueError as e:
+                self.logger.warning(f"Invalid timestamp format in {topic} payload: {payload.timestamp}")
                 return
                 
-            self.logger.info(f"Event message: topic={topic}, active={payload['active']}, time={event_time}")
+            self.logger.info(f"Event message: topic={topic}, active={payload.active}, time={event_time}")
                 
-            if topic == self.config['mqtt']['topics']['motion']:
-                self.oled.show_status(motion_active=payload['active'], motion_time=event_time)
-                if payload['active']:
+            if topic is self._topic_motion:
+                # Motion usually precedes a doorbell press; get the stream ready
+                self.hdmi.prewarm(payload.video_url or self._default_stream)
+                self.oled.show_status(motion_active=payload.active, motion_time=event_time)
+                if payload.active:
                     self.oled.show_scrolling_text("Motion detected on doorbell camera!")
                 else:
                     self.oled.clear_display()
             else:  # Doorbell event
-                if payload['active']:
+                if payload.active:
                     self.oled.show_scrolling_text("Someone's at the door!")
                 else:
                     self.oled.clear_display()
             
-            if payload['active']:
+            if payload.active:
+                # Sound is queued first so it starts while the display powers up
+                if topic is self._topic_doorbell:
+                    self.audio.play_sound(self._default_sound)
                 self.hdmi.turn_on_display()
-                if topic == self.config['mqtt']['topics']['doorbell']:
-                    self.audio.play_sound(self.config['audio']['default_sound'])
                 
-                video_url = payload['video_url'] or self.config['video']['default_stream']
+                video_url = payload.video_url or self._default_stream
                 self.hdmi.play_video(video_url)
                 
         except Exception as e:
@@ -267,50 +508,153 @@ class DoorbellSystem:
             
     def on_message(self, client, userdata, msg):
         """MQTT message received callback.
-        Routes messages to appropriate handlers based on topic.
+        Queues messages on known topics for the event worker.
         
         Args:
             client: MQTT client instance
             userdata: User-defined data passed to callback
             msg: MQTTMessage containing topic and payload"""
-        self.logger.debug(f"Received message on topic {msg.topic}")
+        # paho decodes the topic on every access, so read it once
+        topic = sys.intern(msg.topic)
+        self.logger.debug(f"Received message on topic {topic}")
+        if topic not in self._topic_handlers:
+            return
         try:
-            payload = json.loads(msg.payload.decode())
+            self._event_q.put_nowait((topic, msg.payload))
+        except queue.Full:
+            self.logger.warning(f"Event queue full, dropping message on {topic}")
             
-            if msg.topic in [self.config['mqtt']['topics']['doorbell'], 
-                           self.config['mqtt']['topics']['motion']]:
-                self.handle_event_message(msg.topic, payload)
-            elif msg.topic == self.config['mqtt']['topics']['message']:
-                self.handle_message(payload)
-                
-        except json.JSONDecodeError as e:
-            self.logger.warning(f"Invalid JSON received on topic {msg.topic}: {e}")
-            self.logger.debug(f"Raw payload: {msg.payload}")
+    def _event_worker(self):
+        """Background thread that decodes queued MQTT messages and routes
+        them to the handler for their topic. A None item stops it."""
+        while True:
+            item = self._event_q.get()
+            if item is None:
+                return
+            topic, raw = item
+            decode, handler = self._topic_handlers[topic]
+            try:
+                payload = decode(topic, raw)
+                if payload is not None:
+                    handler(topic, payload)
+            except Exception as e:
+                self.logger.error(f"Error handling message on {topic}: {e}")
             
+    def _decode_event(self, topic, raw):
+        """Decode and validate a doorbell or motion event payload.
+        
+        Args:
+            topic (str): MQTT topic the payload arrived on
+            raw (bytes): Raw MQTT payload
+            
+        Returns:
+            EventPayload: Decoded event, or None if the payload is invalid"""
+        try:
+            return _event_decoder.decode(raw)
+        except msgspec.ValidationError as e:
+            self.logger.warning(f"Invalid payload on {topic}: {e}")
+        except msgspec.DecodeError as e:
+            self.logger.warning(f"Invalid JSON received on topic {topic}: {e}")
+        self.logger.debug(f"Raw payload: {raw}")
+        return None
+        
+    def _decode_message(self, topic, raw):
+        """Decode a display message payload.
+        
+        Only attempts a JSON parse when the payload looks like an object or
+        array; plain-text messages skip the exception path entirely and are
+        returned as bytes, decoded only by handlers that display them.
+        
+        Args:
+            topic (str): MQTT topic the payload arrived on
+            raw (bytes): Raw MQTT payload
+            
+        Returns:
+            dict, list or bytes: Decoded payload"""
+        if raw[:1] in (b'{', b'['):
+            try:
+                return _json_decoder.decode(raw)
+            except msgspec.DecodeError as e:
+                self.logger.warning(f"Invalid JSON received on topic {topic}: {e}")
+                self.logger.debug(f"Raw payload: {raw}")
+        return raw
+        
     def handle_message(self, payload):
         """Process generic message events and display them on the OLED screen.
         
         Args:
-            payload (dict or str): Message to display
+            payload (dict, bytes or str): Message to display
                 If dict: Must have 'text' key with message
+                If bytes: Decoded as UTF-8 and used as message
                 If str: Used directly as message"""
-        message = payload['text'] if isinstance(payload, dict) and 'text' in payload else str(payload)
+        if isinstance(payload, dict) and 'text' in payload:
+            message = payload['text']
+        elif isinstance(payload, (bytes, bytearray)):
+            message = payload.decode('utf-8', 'replace')
+        else:
+            message = str(payload)
         self.logger.info(f"Displaying message: {message}")
         self.oled.show_scrolling_text(message)
         
+    def _pin_mqtt_thread(self):
+        """Pin the MQTT network thread to MQTT_CPU, away from audio playback."""
+        thread = getattr(self.mqtt_client, '_thread', None)
+        if thread is None:
+            return
+        try:
+            if MQTT_CPU in os.sched_getaffinity(0):
+                os.sched_setaffinity(thread.native_id, {MQTT_CPU})
+                self.logger.debug(f"Pinned MQTT thread to CPU {MQTT_CPU}")
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Could not set MQTT thread affinity: {e}")
+            
+    def _lower_display_priority(self):
+        """Renice the calling (main loop) thread to DISPLAY_NICE. Called after
+        the other threads are started so they keep the default priority."""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), DISPLAY_NICE)
+            self.logger.debug(f"Set display loop nice value to {DISPLAY_NICE}")
+        except OSError as e:
+            self.logger.debug(f"Could not lower display loop priority: {e}")
+            
+    def _start_shairport(self):
+        """Open the Shairport metadata pipe and have this loop read it. On
+        failure the loop calls this again once the pipe's retry time passes."""
+        self.shairport.start()
+        if self.shairport.fileno() is not None:
+            self._selector.register(self.shairport.fileno(), selectors.EVENT_READ,
+                                    self.shairport.handle_readable)
+            
+    def wake(self):
+        """Wake the main loop from any thread."""
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe is full, so a wakeup is already pending
+            
+    def _drain_wakeups(self):
+        """Discard pending wakeup bytes from the self-pipe."""
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+            
     def run(self):
         """Main system loop.
         
         - Connects to MQTT broker
-        - Starts Shairport metadata monitoring
-        - Updates OLED display continuously
+        - Starts Shairport metadata monitoring, read from the pipe as it
+          becomes readable
+        - Updates OLED display when woken by a state change, and otherwise
+          when the display says its next frame is due
         - Handles cleanup on shutdown
         
         Raises:
             Exception: If connection fails or system encounters fatal error"""
         self.logger.info("Starting doorbell system")
-        mqtt_username = self.config['mqtt']['username']
-        mqtt_password = self.config['mqtt']['password']
+        mqtt_username = self.config.mqtt.username
+        mqtt_password = self.config.mqtt.password
         
         if mqtt_username and mqtt_password:
             self.mqtt_client.username_pw_set(mqtt_username, mqtt_password)
@@ -318,19 +662,35 @@ class DoorbellSystem:
             
         try:
             self.mqtt_client.connect(
-                self.config['mqtt']['broker'],
-                self.config['mqtt']['port'],
+                self.config.mqtt.broker,
+                self.config.mqtt.port,
                 60
             )
+            self._event_thread.start()
             self.mqtt_client.loop_start()
+            self._pin_mqtt_thread()
             
-            # Start Shairport metadata monitoring
-            self.shairport.start()
+            # Start Shairport metadata monitoring; the pipe is read from this loop
+            self._start_shairport()
             
             self.logger.info("System running")
-            while True:
-                self.oled.update_display()
-                time.sleep(0.1)
+            self._lower_display_priority()
+            self._running = True
+            next_refresh = time.monotonic()
+            while self._running:
+                timeout = max(0.0, next_refresh - time.monotonic())
+                events = self._selector.select(timeout)
+                for key, _ in events:
+                    key.data()
+                    
+                now = time.monotonic()
+                if events or now >= next_refresh:
+                    if now >= self.shairport.next_retry:
+                        self._start_shairport()
+                    self.audio.apply_pending_volume()
+                    self.oled.update_display()
+                    next_refresh = min(now + DISPLAY_IDLE_INTERVAL, self.oled.next_deadline,
+                                       self.audio.next_deadline, self.shairport.next_retry)
                 
         except KeyboardInterrupt:
             self.logger.info("Received shutdown signal")
@@ -349,13 +709,28 @@ class DoorbellSystem:
         - Stops audio and Shairport systems
         - Cleans up OLED display"""
         self.logger.info("Cleaning up system resources")
-        self.mqtt_client.loop_stop()
+        self._running = False
+        self.wake()
+        if self._topic_status:
+            self.mqtt_client.publish(self._topic_status, "offline", qos=1, retain=True)
         self.mqtt_client.disconnect()
+        self.mqtt_client.loop_stop()
+        if self._event_thread.is_alive():
+            try:
+                self._event_q.put(None, timeout=1.0)
+            except queue.Full:
+                pass  # Worker is stuck; it is a daemon thread, so exit anyway
+            self._event_thread.join(timeout=1.0)
         self.encoders.cleanup()
         self.hdmi.turn_off_display()
         self.audio.cleanup()
+        if self.shairport.fileno() is not None:
+            self._selector.unregister(self.shairport.fileno())
         self.shairport.stop()
         self.oled.cleanup()
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
         self.logger.info("Cleanup complete")
 
 if __name__ == "__main__":
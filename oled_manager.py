@@ -1,12 +1,131 @@
+import math
 import time
+import heapq
+import bisect
+import itertools
+import functools
+from collections import OrderedDict
+import string
 import logging
-from datetime import datetime
-from luma.core.interface.serial import i2c
-from luma.core.render import canvas
-from luma.oled.device import ssd1305
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+from smbus2 import SMBus, i2c_msg
 import threading
 
+# Seconds a long message holds still before it starts, and after each pass
+SCROLL_PAUSE = 2.0
+
+# Scroll speed in pixels per second
+SCROLL_SPEED = 20
+
+# Whole strings whose measured width is kept for reuse across frames
+TEXT_WIDTH_CACHE_SIZE = 256
+
+# I2C control byte that marks the rest of a transfer as display RAM data
+SSD1305_DATA_PREFIX = b"\x40"
+
+# Share of the panel a frame's changed rectangle may cover before the whole
+# frame is sent instead
+FULL_FRAME_RATIO = 0.75
+
+# Height in pixels of the clock/motion status bar, including its separator
+STATUS_BAR_HEIGHT = 10
+
+# Top row of the scrolling message
+SCROLL_Y = 16
+
+# Font Awesome solid face used for the status bar icons
+ICON_FONT_PATH = "/usr/share/fonts/fontawesome/fa-solid-900.ttf"
+
+# Face used for all text
+TEXT_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+@functools.lru_cache(maxsize=8)
+def _load_font(path, size):
+    """Load a TrueType font once per process. Each truetype() call parses
+    the file and sets up a new FreeType face, so every OLEDManager shares
+    the same font objects.
+    
+    Args:
+        path (str): Path to the .ttf file
+        size (int): Font size in pixels
+        
+    Returns:
+        ImageFont.FreeTypeFont: The loaded font
+        
+    Raises:
+        OSError: If the font can't be loaded (failures aren't cached)"""
+    return ImageFont.truetype(path, size)
+
+class _Scheduler:
+    """Runs callbacks after a delay on one shared background thread, in
+    deadline order from a heap."""
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+    def schedule(self, delay, callback):
+        """Run a callback once after a delay.
+        
+        Args:
+            delay (float): Seconds to wait
+            callback (callable): Called with no arguments on the scheduler thread
+            
+        Returns:
+            list: Token for cancel()"""
+        entry = [time.monotonic() + delay, next(self._seq), callback]
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._cond.notify()
+        return entry
+        
+    def cancel(self, token):
+        """Cancel a scheduled callback. Does nothing if it already ran.
+        
+        Args:
+            token (list): Token returned by schedule()"""
+        with self._cond:
+            token[2] = None
+            
+    def _run(self):
+        """Scheduler thread: sleep until the earliest deadline, then run
+        every callback that is due. Cancelled entries are skipped."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, _, callback = self._heap[0]
+                if callback is None:
+                    heapq.heappop(self._heap)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                self._cond.release()
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"Error in scheduled display callback: {e}")
+                finally:
+                    self._cond.acquire()
+                    
+    def stop(self):
+        """Stop the scheduler thread, dropping pending callbacks."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
 class OLEDManager:
     """OLED display manager providing a clean API for display updates.
     All display manipulations should go through this class."""
@@ -23,6 +142,9 @@ class OLEDManager:
             i2c_address (int): I2C address of the display"""
         self.logger = logging.getLogger(__name__)
         try:
+            # Imported here so the display helpers can be used without luma
+            from luma.core.interface.serial import i2c
+            from luma.oled.device import ssd1305
             serial = i2c(port=i2c_port, address=i2c_address)
             self.device = ssd1305(serial, width=128, height=32)
             self.device.contrast(255)
@@ -31,43 +153,194 @@ class OLEDManager:
             self.logger.error(f"Failed to initialize OLED display: {e}")
             raise
         
+        # Frames are bit-packed with NumPy and sent in a single I2C transfer;
+        # luma's display() is the fallback if its device internals differ
+        try:
+            self._bus = SMBus(i2c_port)
+            self._i2c_address = i2c_address
+            const = self.device._const
+            self._column_cmd = const.COLUMNADDR
+            self._page_cmd = const.PAGEADDR
+            self._colstart = self.device._colstart
+        except (AttributeError, OSError) as e:
+            self.logger.warning(f"Falling back to luma for OLED frame transfers: {e}")
+            self._bus = None
+        
+        # Page buffer last sent to the panel, so a frame only transmits the
+        # rectangle of pages and columns that changed; None forces a full frame
+        self._prev_pages = None
+        
+        # Outgoing transfer, reused for every frame: the data control byte
+        # followed by room for a full frame, with a NumPy view over the payload
+        self._i2c_buf = bytearray(SSD1305_DATA_PREFIX) + bytearray(self.device.width * self.device.height // 8)
+        self._i2c_payload = np.frombuffer(self._i2c_buf, dtype=np.uint8, offset=len(SSD1305_DATA_PREFIX))
+        
         # Display state
         self.current_mode = "default"  # default, centered, scrolling
         self.scroll_position = 0
         self.scroll_start_time = None
-        self.scroll_paused = True
         
         # Message state
         self.current_message = ""
         self.temporary_message = None
         self.temp_duration = 0
-        self.temp_message_thread = None
+        self._temp_event = None
+        # Bumped for every temporary message; a restore only applies if it
+        # belongs to the latest one
+        self._temp_generation = 0
         self.previous_message = ""
         
         # Motion state
-        self.last_motion_time = None
+        self._last_motion_mono = None
         self.motion_active = False
         
         # Display content
         self.line1 = ""
         self.line2 = ""
         
+        # Mutators run on MQTT, encoder and scheduler threads while the main
+        # loop renders; the lock keeps each frame's view of the state whole
+        self._state_lock = threading.Lock()
+        
+        # Persistent frame buffer, cleared and redrawn in place each frame
+        self._img = Image.new(self.device.mode, self.device.size)
+        self._draw = ImageDraw.Draw(self._img)
+        
+        # Status bar, redrawn only when the clock or motion text changes and
+        # pasted into each frame
+        self._top_strip = Image.new(self.device.mode, (self.device.width, STATUS_BAR_HEIGHT))
+        self._top_strip_draw = ImageDraw.Draw(self._top_strip)
+        self._top_strip_key = None
+        
+        # A long message is rendered once into a strip with a screen width of
+        # blank lead-in, and each frame copies the visible window out of it
+        self._scroll_img = None
+        self._scroll_img_text = None
+        
+        # Content drawn in the last frame, to skip redundant redraws. Between
+        # state changes nothing can differ before _next_deadline, when the
+        # clock or motion age next rolls over or a scrolling message next moves
+        self._last_sig = None
+        self._dirty = True
+        self._next_deadline = 0.0
+        self._scroll_deadline = 0.0
+        self._msg_width = 0
+        
+        # Status bar clock text, reformatted only when the minute changes
+        self._last_minute = -1
+        self._last_time_str = ""
+        
+        # One scheduler thread runs every timed callback (temporary message
+        # restores) instead of a thread per timer
+        self._scheduler = _Scheduler()
+        
+        # Called whenever display state changes, so the owner can redraw promptly
+        self._on_change = None
+        
         # Load fonts - try Font Awesome first, then fallback fonts
         try:
-            self.icon_font = ImageFont.truetype("/usr/share/fonts/fontawesome/fa-solid-900.ttf", 8)
-            self.text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 8)
+            self.icon_font = _load_font(ICON_FONT_PATH, 8)
+            self.text_font = _load_font(TEXT_FONT_PATH, 8)
             self.logger.info("Loaded Font Awesome and DejaVu Sans fonts")
         except OSError as e:
             self.logger.warning(f"Could not load preferred fonts, falling back to alternatives: {e}")
             try:
-                self.text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 8)
+                self.text_font = _load_font(TEXT_FONT_PATH, 8)
                 self.icon_font = self.text_font  # Fallback to regular font if FA not available
                 self.logger.info("Loaded DejaVu Sans font as fallback")
             except OSError as e:
                 self.logger.warning(f"Could not load DejaVu Sans font, using default: {e}")
                 self.text_font = ImageFont.load_default()
                 self.icon_font = self.text_font
+        
+        # Measured widths of whole strings, most recently used last. Mutators
+        # measure from other threads, so updates are locked
+        self._tl_cache = OrderedDict()
+        self._tl_lock = threading.Lock()
+        
+        # Per-glyph advance widths, for finding truncation points
+        self._char_w = {c: self.text_font.getlength(c) for c in string.printable}
+        
+        # Height of a line of text below the draw origin; constant for a fixed
+        # size font, so measure it once with an ascender and a descender
+        self._line_h = self.text_font.getbbox("Hg")[3]
+        self._ellipsis_w = self._tl("...", self.text_font)
+        self._clock_icon_w = self._tl(self.ICON_CLOCK, self.icon_font)
+        self._motion_icon_w = self._tl(self.ICON_WALKING, self.icon_font)
+        
+        # Icons never change, so rasterize each glyph once and paste it
+        self._clock_icon_img = self._render_icon(self.ICON_CLOCK, self._clock_icon_w)
+        self._motion_icon_img = self._render_icon(self.ICON_WALKING, self._motion_icon_w)
+        
+    def _render_icon(self, icon, width):
+        """Rasterize an icon glyph into a bitmap sized for the status bar.
+        
+        Args:
+            icon (str): Icon font character
+            width (float): Advance width of the glyph
+            
+        Returns:
+            PIL.Image.Image: Glyph drawn at the image origin"""
+        img = Image.new(self.device.mode, (math.ceil(width), STATUS_BAR_HEIGHT - 1))
+        ImageDraw.Draw(img).text((0, 0), icon, font=self.icon_font, fill="white")
+        return img
+        
+    def _tl(self, text, font):
+        """Measure text, reusing the width from an earlier frame if the same
+        string was measured recently.
+        
+        Args:
+            text (str): Text to measure
+            font: PIL font to measure it in
+            
+        Returns:
+            float: Width in pixels"""
+        key = (id(font), text)
+        cache = self._tl_cache
+        with self._tl_lock:
+            width = cache.get(key)
+            if width is not None:
+                cache.move_to_end(key)
+                return width
+        width = font.getlength(text)
+        with self._tl_lock:
+            cache[key] = width
+            if len(cache) > TEXT_WIDTH_CACHE_SIZE:
+                cache.popitem(last=False)
+        return width
+        
+    def _glyph_width(self, c):
+        """Get the advance width of one character in the text font.
+        
+        Args:
+            c (str): Character to measure
+            
+        Returns:
+            float: Width in pixels"""
+        w = self._char_w.get(c)
+        if w is None:
+            w = self._char_w[c] = self.text_font.getlength(c)
+        return w
 
+    def set_change_callback(self, callback):
+        """Register a function to call whenever display state changes.
+        
+        Args:
+            callback (callable): Called with no arguments, from whichever
+                thread changed the state"""
+        self._on_change = callback
+        
+    def _changed(self):
+        """Notify the owner that the display needs redrawing."""
+        self._dirty = True
+        if self._on_change:
+            self._on_change()
+            
+    @property
+    def next_deadline(self):
+        """float: time.monotonic() value at which the frame next changes."""
+        return self._next_deadline
+        
     def show_centered_text(self, line1, line2="", duration=None):
         """Display two lines of centered text. Each line is truncated if too long.
         
@@ -76,12 +349,12 @@ class OLEDManager:
             line2 (str, optional): Second line of text (bottom)
             duration (float, optional): How long to show text before reverting"""
         self.logger.debug(f"Showing centered text: '{line1}' / '{line2}' (duration: {duration}s)")
-        self.current_mode = "centered"
-        self.line1 = line1
-        self.line2 = line2
-        
-        if duration:
-            self._set_temporary_message(duration)
+        with self._state_lock:
+            self._begin_message(duration)
+            self.current_mode = "centered"
+            self.line1 = line1
+            self.line2 = line2
+        self._changed()
         
     def show_scrolling_text(self, text, duration=None):
         """Display a scrolling message in the bottom portion of the display.
@@ -90,14 +363,15 @@ class OLEDManager:
             text (str): Text to scroll
             duration (float, optional): How long to show text before reverting"""
         self.logger.debug(f"Showing scrolling text: '{text}' (duration: {duration}s)")
-        self.current_mode = "scrolling"
-        self.current_message = text
-        self.scroll_position = 0
-        self.scroll_start_time = None
-        self.scroll_paused = True
-        
-        if duration:
-            self._set_temporary_message(duration)
+        msg_width = self._tl(text, self.text_font)
+        with self._state_lock:
+            self._begin_message(duration)
+            self.current_mode = "scrolling"
+            self.current_message = text
+            self._msg_width = msg_width
+            self.scroll_position = 0
+            self.scroll_start_time = None
+        self._changed()
             
     def show_status(self, motion_active=None, motion_time=None):
         """Update the motion detection status display.
@@ -105,31 +379,54 @@ class OLEDManager:
         Args:
             motion_active (bool, optional): Whether motion is currently active
             motion_time (datetime, optional): Time of last motion detection"""
+        with self._state_lock:
+            if motion_active is not None:
+                self.motion_active = motion_active
+            if motion_time is not None:
+                # Kept on the monotonic clock so wall-clock steps don't skew the age
+                self._last_motion_mono = time.monotonic() - (time.time() - motion_time.timestamp())
         if motion_active is not None:
-            self.motion_active = motion_active
             self.logger.info(f"Motion status changed: {'active' if motion_active else 'inactive'}")
         if motion_time is not None:
-            self.last_motion_time = motion_time
             self.logger.debug(f"Motion time updated: {motion_time}")
+        self._changed()
             
     def clear_display(self):
         """Clear all content from the display and cancel any temporary messages."""
         self.logger.debug("Clearing display")
-        self.current_mode = "default"
-        self.current_message = ""
-        self.line1 = ""
-        self.line2 = ""
-        self._cancel_temporary_message()
+        with self._state_lock:
+            self.current_mode = "default"
+            self.current_message = ""
+            self._msg_width = 0
+            self.line1 = ""
+            self.line2 = ""
+            self._cancel_temporary_message()
+        self._changed()
         
+    def _begin_message(self, duration):
+        """Prepare for a new message, before the display state is changed.
+        A temporary message remembers the state to revert to; a permanent
+        one replaces any pending revert. Called with _state_lock held.
+        
+        Args:
+            duration (float): Seconds the message stays up, or None to keep it"""
+        if duration:
+            self._set_temporary_message(duration)
+        else:
+            self._cancel_temporary_message()
+            
     def _set_temporary_message(self, duration):
-        """Set up a temporary message that reverts after duration.
+        """Set up a temporary message that reverts after duration. Must be
+        called before the display state is changed to the new message.
         
         Args:
             duration (float): Time in seconds before reverting to previous state"""
+        previous = self.temporary_message
         self._cancel_temporary_message()
         
-        # Store current state
-        self.temporary_message = {
+        # Store the state to revert to. A temporary message replacing another
+        # one reverts to what was showing before either of them
+        self.temporary_message = previous or {
             'mode': self.current_mode,
             'message': self.current_message,
             'line1': self.line1,
@@ -137,147 +434,314 @@ class OLEDManager:
         }
         self.temp_duration = duration
         
-        # Set up restore timer
-        self.temp_message_thread = threading.Timer(duration, self._restore_previous_state)
-        self.temp_message_thread.start()
+        # Set up restore timer. cancel() can't stop a callback the scheduler
+        # has already picked up, so the restore also checks its generation
+        self._temp_generation += 1
+        self._temp_event = self._scheduler.schedule(
+            duration, functools.partial(self._restore_previous_state, self._temp_generation))
         self.logger.debug(f"Set temporary message for {duration}s")
         
     def _cancel_temporary_message(self):
         """Cancel any active temporary message and its timer."""
-        if self.temp_message_thread and self.temp_message_thread.is_alive():
-            self.temp_message_thread.cancel()
+        if self._temp_event:
+            self._scheduler.cancel(self._temp_event)
+            self._temp_event = None
             self.logger.debug("Cancelled temporary message")
         self.temporary_message = None
         
-    def _restore_previous_state(self):
-        """Restore the display state from before a temporary message."""
-        if self.temporary_message:
-            self.logger.debug("Restoring previous display state")
-            self.current_mode = self.temporary_message['mode']
-            self.current_message = self.temporary_message['message']
-            self.line1 = self.temporary_message['line1']
-            self.line2 = self.temporary_message['line2']
+    def _restore_previous_state(self, generation):
+        """Restore the display state from before a temporary message.
+        
+        Args:
+            generation (int): _temp_generation when the restore was scheduled;
+                a restore for a message that has since been replaced does nothing"""
+        with self._state_lock:
+            previous = self.temporary_message
+            if not previous or generation != self._temp_generation:
+                return
+            self.current_mode = previous['mode']
+            self.current_message = previous['message']
+            self._msg_width = self._tl(self.current_message, self.text_font)
+            self.line1 = previous['line1']
+            self.line2 = previous['line2']
             self.temporary_message = None
+            self._temp_event = None
+        self.logger.debug("Restoring previous display state")
+        self._changed()
             
-    def _truncate_text(self, text, max_width, draw):
+    def _truncate_text(self, text, max_width):
         """Truncate text to fit within given width, adding ellipsis if needed.
         
         Args:
             text (str): Text to truncate
             max_width (int): Maximum width in pixels
-            draw: PIL ImageDraw object
             
         Returns:
             str: Truncated text with ellipsis if needed"""
-        if draw.textlength(text, font=self.text_font) <= max_width:
+        if self._tl(text, self.text_font) <= max_width:
             return text
-            
-        while len(text) > 3 and draw.textlength(text[:-3] + "...", font=self.text_font) > max_width:
-            text = text[:-4]
-        return text + "..."
         
-    def _center_text(self, text, draw, area_width, area_height, y_offset=0):
+        # Longest prefix that leaves room for the ellipsis
+        prefix = list(itertools.accumulate(map(self._glyph_width, text)))
+        end = bisect.bisect_right(prefix, max_width - self._ellipsis_w)
+        return text[:end] + "..."
+        
+    def _center_text(self, text, area_width, area_height, y_offset=0):
         """Calculate position to center text within given area.
         
         Args:
             text (str): Text to center
-            draw: PIL ImageDraw object
             area_width (int): Width of area
             area_height (int): Height of area
             y_offset (int): Additional vertical offset
             
         Returns:
             tuple: (x, y) coordinates for centered text"""
-        text_width = draw.textlength(text, font=self.text_font)
-        text_height = self.text_font.getsize(text)[1]
+        text_width = self._tl(text, self.text_font)
         x = (area_width - text_width) // 2
-        y = y_offset + (area_height - text_height) // 2
+        y = y_offset + (area_height - self._line_h) // 2
         return x, y
         
-    def _format_motion_time(self):
+    def _format_motion_time(self, now=None):
         """Format time since last motion for display.
         
+        Args:
+            now (float, optional): Current time.monotonic() value, so a frame
+                can share one clock read across everything it draws
+        
         Returns:
             str: Formatted time string"""
         if self.motion_active:
             return "now"
-        if self.last_motion_time is None:
+        if self._last_motion_mono is None:
             return "??"
-        delta = datetime.now() - self.last_motion_time
-        minutes = int(delta.total_seconds() / 60)
+        if now is None:
+            now = time.monotonic()
+        # Clamped so a motion timestamp slightly ahead of our clock reads 0m
+        minutes = int(max(0.0, now - self._last_motion_mono) // 60)
         if minutes < 60:
             return f"{minutes}m"
         hours = minutes // 60
         return f"{hours}h"
         
-    def update_display(self):
-        """Update the OLED display. Should be called regularly in the main loop."""
-        with canvas(self.device) as draw:
-            # Always show status bar at top
-            current_time = datetime.now().strftime("%m/%d %H:%M")
-            time_text = f"{self.ICON_CLOCK} {current_time}"
-            motion_text = f"{self.ICON_WALKING} {self._format_motion_time()}"
-            
-            # Draw time with icon
-            icon_width = draw.textlength(self.ICON_CLOCK, font=self.icon_font)
-            draw.text((0, 0), self.ICON_CLOCK, font=self.icon_font, fill="white")
-            draw.text((icon_width + 2, 0), current_time, font=self.text_font, fill="white")
-            
-            # Calculate separator position
-            separator_x = int(self.device.width * 0.75)
-            draw.line([(separator_x, 0), (separator_x, 8)], fill="white", width=1)
+    def _rebuild_top_strip(self, current_time, motion_time):
+        """Redraw the cached status bar image.
+        
+        Args:
+            current_time (str): Clock text
+            motion_time (str): Time since last motion"""
+        draw = self._top_strip_draw
+        draw.rectangle((0, 0, self.device.width, STATUS_BAR_HEIGHT), fill=0)
+        
+        # Draw time with icon
+        icon_width = self._clock_icon_w
+        self._top_strip.paste(self._clock_icon_img, (0, 0))
+        draw.text((icon_width + 2, 0), current_time, font=self.text_font, fill="white")
+        
+        # Calculate separator position
+        separator_x = int(self.device.width * 0.75)
+        draw.line([(separator_x, 0), (separator_x, 8)], fill="white", width=1)
+        
+        # Draw motion status with icon
+        motion_icon_width = self._motion_icon_w
+        motion_text_width = self._tl(motion_time, self.text_font)
+        motion_total_width = motion_icon_width + 2 + motion_text_width
+        motion_x = self.device.width - motion_total_width
+        
+        self._top_strip.paste(self._motion_icon_img, (round(motion_x), 0))
+        draw.text((motion_x + motion_icon_width + 2, 0), motion_time, font=self.text_font, fill="white")
+        
+        # Draw horizontal separator
+        draw.line([(0, 9), (self.device.width-1, 9)], fill="white", width=1)
+        
+        self._top_strip_key = (current_time, motion_time)
+        
+    def _render_scroll_strip(self, text):
+        """Render a scrolling message into the offscreen strip.
+        
+        Args:
+            text (str): Message to render"""
+        width = self.device.width + int(self._tl(text, self.text_font)) + 1
+        self._scroll_img = Image.new(self.device.mode, (width, self.device.height - SCROLL_Y))
+        ImageDraw.Draw(self._scroll_img).text((self.device.width, 0), text, font=self.text_font, fill="white")
+        self._scroll_img_text = text
+        
+    def _compute_next_deadline(self, now_mono, now):
+        """Work out when the status bar text will next change.
+        
+        Args:
+            now_mono (float): Current time.monotonic() value
+            now (float): Current epoch time
             
-            # Draw motion status with icon
-            motion_icon_width = draw.textlength(self.ICON_WALKING, font=self.icon_font)
-            motion_text_width = draw.textlength(self._format_motion_time(), font=self.text_font)
-            motion_total_width = motion_icon_width + 2 + motion_text_width
-            motion_x = self.device.width - motion_total_width
+        Returns:
+            float: time.monotonic() value of the next clock minute or motion
+                age rollover, whichever comes first"""
+        deadline = now_mono + 60 - now % 60
+        if not self.motion_active and self._last_motion_mono is not None:
+            age = now_mono - self._last_motion_mono
+            deadline = min(deadline, now_mono + 60 - age % 60)
+        return deadline
+        
+    def _compute_scroll_x(self, msg_width, now):
+        """Get the x position of the scrolling message for a frame.
+        
+        A message that fits is centered. A longer one starts just off the
+        right edge, holds for SCROLL_PAUSE, then scrolls at SCROLL_SPEED
+        until its end reaches the right edge, holds there for SCROLL_PAUSE
+        and starts over.
+        
+        Args:
+            msg_width (float): Width of the message in pixels
+            now (float): Current time.monotonic() value
             
-            draw.text((motion_x, 0), self.ICON_WALKING, font=self.icon_font, fill="white")
-            draw.text((motion_x + motion_icon_width + 2, 0), self._format_motion_time(), font=self.text_font, fill="white")
+        Returns:
+            int: x coordinate to draw the message at
             
-            # Draw horizontal separator
-            draw.line([(0, 9), (self.device.width-1, 9)], fill="white", width=1)
+        Note:
+            Also sets _scroll_deadline to when the message next moves"""
+        if msg_width <= self.device.width:
+            return int(self.device.width - msg_width) // 2
+        if self.scroll_start_time is None:
+            self.scroll_start_time = now
+        elapsed = now - self.scroll_start_time - SCROLL_PAUSE
+        if elapsed < 0:
+            self.scroll_position = 0
+            self._scroll_deadline = now - elapsed
+        else:
+            cycle = msg_width / SCROLL_SPEED + SCROLL_PAUSE
+            phase = elapsed % cycle
+            position = int(phase * SCROLL_SPEED)
+            if position >= int(msg_width):
+                self.scroll_position = int(msg_width)
+                self._scroll_deadline = now + cycle - phase
+            else:
+                self.scroll_position = position
+                self._scroll_deadline = now + (position + 1) / SCROLL_SPEED - phase
+        return self.device.width - self.scroll_position
+        
+    def _flush(self):
+        """Send the frame buffer to the panel. Each 8-row page becomes one
+        byte per column, least significant bit on top, as the controller
+        expects in horizontal addressing mode. Only the smallest rectangle of
+        pages and columns covering every change since the previous frame is
+        sent, as one transfer."""
+        if self._bus is None:
+            self.device.display(self._img)
+            return
+        width = self.device.width
+        # Mode "1" raw bytes are rows packed MSB first; unpack them to one
+        # byte per pixel rather than going through Pillow's array conversion
+        bits = np.unpackbits(np.frombuffer(self._img.tobytes(), dtype=np.uint8)).reshape(-1, 8, width)
+        pages = np.packbits(bits, axis=1, bitorder='little').reshape(-1, width)
+        
+        prev = self._prev_pages
+        if prev is None:
+            self._write_region(0, len(pages) - 1, 0, width, pages)
+        else:
+            changed = pages != prev
+            rows = np.flatnonzero(changed.any(axis=1))
+            if not rows.size:
+                return
+            cols = np.flatnonzero(changed.any(axis=0))
+            first, last = int(rows[0]), int(rows[-1])
+            lo, hi = int(cols[0]), int(cols[-1]) + 1
+            if (last - first + 1) * (hi - lo) > FULL_FRAME_RATIO * pages.size:
+                first, last, lo, hi = 0, len(pages) - 1, 0, width
+            self._write_region(first, last, lo, hi, pages[first:last + 1])
+        self._prev_pages = pages
+        
+    def _write_region(self, first_page, last_page, lo, hi, pages):
+        """Set the controller's RAM window and write one block of page data.
+        
+        Args:
+            first_page (int): First page of the window
+            last_page (int): Last page of the window
+            lo (int): First column of the window
+            hi (int): Column just past the end of the window
+            pages (numpy.ndarray): Page rows covering the window, full width"""
+        self.device.command(self._column_cmd, self._colstart + lo, self._colstart + hi - 1,
+                            self._page_cmd, first_page, last_page)
+        size = len(pages) * (hi - lo)
+        self._i2c_payload[:size].reshape(len(pages), hi - lo)[:] = pages[:, lo:hi]
+        try:
+            self._bus.i2c_rdwr(i2c_msg.write(self._i2c_address,
+                                             memoryview(self._i2c_buf)[:len(SSD1305_DATA_PREFIX) + size]))
+        except OSError:
+            # The panel may now hold a partial frame, so resend it all next time
+            self._prev_pages = None
+            raise
+        
+    def update_display(self):
+        """Update the OLED display. Should be called regularly in the main loop.
+        
+        The frame is only redrawn and sent over I2C when its content differs
+        from the last frame drawn. A scrolling message counts as changed only
+        when it has moved a pixel, so the pauses at either end cost nothing.
+        With no state change since the last call and no clock, motion age or
+        scroll step due, it returns after a single time comparison."""
+        now_mono = time.monotonic()
+        if not self._dirty and now_mono < self._next_deadline:
+            return
+        with self._state_lock:
+            self._dirty = False
+            mode = self.current_mode
+            line1, line2 = self.line1, self.line2
+            message, msg_width = self.current_message, self._msg_width
+        scrolling = mode == "scrolling" and msg_width > self.device.width
+        
+        now = time.time()
+        minute = int(now) // 60
+        if minute != self._last_minute:
+            t = time.localtime(now)
+            self._last_minute = minute
+            self._last_time_str = f"{t.tm_mon:02d}/{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}"
+        current_time = self._last_time_str
+        motion_time = self._format_motion_time(now_mono)
+        self._next_deadline = self._compute_next_deadline(now_mono, now)
+        x_pos = None
+        if mode == "scrolling" and message:
+            x_pos = self._compute_scroll_x(msg_width, now_mono)
+            if scrolling:
+                self._next_deadline = min(self._next_deadline, self._scroll_deadline)
+        sig = (current_time, motion_time, mode, line1, line2, message, x_pos)
+        if sig == self._last_sig:
+            return
+        self._last_sig = sig
+        
+        draw = self._draw
+        if (current_time, motion_time) != self._top_strip_key:
+            self._rebuild_top_strip(current_time, motion_time)
+        self._img.paste(self._top_strip, (0, 0))
+        draw.rectangle((0, STATUS_BAR_HEIGHT, self.device.width, self.device.height), fill=0)
+        
+        # Draw main content based on current mode
+        if mode == "centered":
+            if line1:
+                truncated_line1 = self._truncate_text(line1, self.device.width)
+                x1, y1 = self._center_text(truncated_line1, self.device.width, 12, 10)
+                draw.text((x1, y1), truncated_line1, font=self.text_font, fill="white")
             
-            # Draw main content based on current mode
-            if self.current_mode == "centered":
-                if self.line1:
-                    truncated_line1 = self._truncate_text(self.line1, self.device.width, draw)
-                    x1, y1 = self._center_text(truncated_line1, draw, self.device.width, 12, 10)
-                    draw.text((x1, y1), truncated_line1, font=self.text_font, fill="white")
-                
-                if self.line2:
-                    truncated_line2 = self._truncate_text(self.line2, self.device.width, draw)
-                    x2, y2 = self._center_text(truncated_line2, draw, self.device.width, 12, 22)
-                    draw.text((x2, y2), truncated_line2, font=self.text_font, fill="white")
-                    
-            elif self.current_mode == "scrolling" and self.current_message:
-                msg_width = draw.textlength(self.current_message, font=self.text_font)
+            if line2:
+                truncated_line2 = self._truncate_text(line2, self.device.width)
+                x2, y2 = self._center_text(truncated_line2, self.device.width, 12, 22)
+                draw.text((x2, y2), truncated_line2, font=self.text_font, fill="white")
                 
-                if msg_width > self.device.width:
-                    current_time = time.time()
-                    
-                    if self.scroll_start_time is None:
-                        self.scroll_start_time = current_time
-                        
-                    if current_time - self.scroll_start_time < 2.0:
-                        x_pos = self.device.width
-                    elif self.scroll_paused and current_time - self.scroll_start_time >= 2.0:
-                        self.scroll_paused = False
-                        self.scroll_position = 0
-                    elif self.scroll_position >= msg_width and not self.scroll_paused:
-                        self.scroll_paused = True
-                        self.scroll_start_time = current_time
-                    elif not self.scroll_paused:
-                        self.scroll_position += 1
-                        
-                    x_pos = self.device.width - self.scroll_position
-                    draw.text((x_pos, 16), self.current_message, font=self.text_font, fill="white")
-                else:
-                    x_pos = (self.device.width - msg_width) // 2
-                    draw.text((x_pos, 16), self.current_message, font=self.text_font, fill="white")
-                    
+        elif x_pos is not None:
+            if scrolling:
+                if self._scroll_img_text != message:
+                    self._render_scroll_strip(message)
+                offset = self.device.width - x_pos
+                window = (offset, 0, offset + self.device.width, self._scroll_img.height)
+                self._img.paste(self._scroll_img.crop(window), (0, SCROLL_Y))
+            else:
+                draw.text((x_pos, SCROLL_Y), message, font=self.text_font, fill="white")
+        
+        self._flush()
+        
     def cleanup(self):
         """Clean up resources and cancel any active timers."""
         self.logger.debug("Cleaning up resources")
-        self._cancel_temporary_message()
\ No newline at end of file
+        self._cancel_temporary_message()
+        self._scheduler.stop()
+        if self._bus is not None:
+            self._bus.close()
\ No newline at end of file
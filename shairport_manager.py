@@ -1,8 +1,30 @@
-import threading
+import os
+import re
+import math
+import stat
 import time
+import base64
+import binascii
 import logging
-from shairport_sync_metadata.metadata_reader import MetadataReader
-from shairport_sync_metadata.metadata import Item
+
+# Bytes requested per read from the metadata pipe
+PIPE_READ_SIZE = 65536
+
+# Seconds between attempts to open the metadata pipe after a failure
+PIPE_RETRY_INTERVAL = 5.0
+
+# Permissions for a pipe we create, so shairport-sync (its own user) can write it
+PIPE_MODE = 0o666
+
+# One complete metadata item: hex-encoded type and code, and the base64
+# payload when there is one. Items look like
+#   <item><type>636f7265</type><code>6d696e6d</code><length>5</length>
+#   <data encoding="base64">
+#   VGl0bGU=</data></item>
+_ITEM_RE = re.compile(
+    rb"<item>\s*<type>([0-9a-f]{8})</type>\s*<code>([0-9a-f]{8})</code>\s*"
+    rb"<length>\d+</length>\s*(?:<data[^>]*>([^<]*)</data>\s*)?</item>"
+)
 
 class ShairportManager:
     def __init__(self, pipe_path, oled_manager=None, show_duration=10):
@@ -16,60 +38,154 @@ class ShairportManager:
         self.pipe_path = pipe_path
         self.oled_manager = oled_manager
         self.show_duration = show_duration
-        self.reader = None
-        self.reader_thread = None
-        self.running = False
+        self._fd = None
+        self._buf = b""
+        self._next_open = 0.0
         self.current_track = None
-        self.display_thread = None
+        
+        # Set when a new title arrives; the track is shown at the end of the
+        # metadata bundle it belongs to
+        self._pending_update = False
+        
+        # (type, code) -> handler(text), built once for _process_item
+        self._meta_dispatch = {
+            ('core', 'asal'): self._set_album,
+            ('core', 'asar'): self._set_artist,
+            ('core', 'minm'): self._set_title,
+            ('ssnc', 'mden'): self._on_metadata_end,
+            ('ssnc', 'pend'): self._on_playback_end,
+        }
         self.logger.info(f"Initialized Shairport metadata manager with pipe: {pipe_path}")
         
     def start(self):
-        """Start monitoring Shairport Sync metadata in a background thread."""
-        self.running = True
-        self.reader_thread = threading.Thread(target=self._read_metadata)
-        self.reader_thread.daemon = True
-        self.reader_thread.start()
-        self.logger.info("Started Shairport metadata monitoring")
+        """Open the metadata pipe for non-blocking reads, creating it if
+        shairport-sync hasn't yet. The owner should watch fileno() for
+        readability and call handle_readable(). If the pipe can't be opened,
+        call start() again once next_retry has passed.
+        
+        Opened read-write so the pipe never reports EOF when shairport-sync
+        restarts; with no writer a read-only FIFO would poll readable forever."""
+        try:
+            if not os.path.exists(self.pipe_path):
+                os.mkfifo(self.pipe_path)
+                # mkfifo's mode is filtered by our umask; shairport-sync runs
+                # as a different user and needs to open the pipe for writing
+                os.chmod(self.pipe_path, PIPE_MODE)
+                self.logger.info(f"Created metadata pipe: {self.pipe_path}")
+            elif not stat.S_ISFIFO(os.stat(self.pipe_path).st_mode):
+                self.logger.error(f"Metadata pipe path is not a FIFO: {self.pipe_path}")
+                self._next_open = time.monotonic() + PIPE_RETRY_INTERVAL
+                return
+            self._fd = os.open(self.pipe_path, os.O_RDWR | os.O_NONBLOCK)
+            self.logger.info("Started Shairport metadata monitoring")
+        except OSError as e:
+            self.logger.error(f"Failed to open metadata pipe {self.pipe_path}: {e}")
+            self._next_open = time.monotonic() + PIPE_RETRY_INTERVAL
+            
+    @property
+    def next_retry(self):
+        """float: time.monotonic() value after which start() should be tried
+        again, or infinity while the pipe is open."""
+        if self._fd is not None:
+            return math.inf
+        return self._next_open
+            
+    def fileno(self):
+        """Get the metadata pipe's file descriptor.
+        
+        Returns:
+            int: Descriptor to poll for reading, or None if the pipe isn't open"""
+        return self._fd
         
     def stop(self):
         """Stop monitoring metadata and clean up resources."""
-        self.running = False
-        if self.reader:
-            self.reader.stop()
-        if self.reader_thread:
-            self.reader_thread.join()
-        if self.display_thread and self.display_thread.is_alive():
-            self.display_thread.cancel()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._buf = b""
+        # Stopped on purpose, so don't let the owner reopen it
+        self._next_open = math.inf
+        self._pending_update = False
         self.logger.info("Stopped Shairport metadata monitoring")
+        
+    def handle_readable(self):
+        """Read everything available on the pipe and process each complete
+        metadata item in one regex pass. Anything after the last complete
+        item is kept for the next read."""
+        try:
+            while True:
+                chunk = os.read(self._fd, PIPE_READ_SIZE)
+                if not chunk:
+                    break
+                self._buf += chunk
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            self.logger.error(f"Error reading Shairport metadata: {e}")
+            return
             
-    def _handle_metadata(self, item: Item):
-        """Process metadata items from Shairport.
+        end = 0
+        for match in _ITEM_RE.finditer(self._buf):
+            self._process_item(*match.groups())
+            end = match.end()
+        self._buf = self._buf[end:]
+        
+    def _process_item(self, item_type, code, data):
+        """Decode one metadata item and pass its text to the handler for its
+        type and code, if there is one.
         
         Args:
-            item (Item): Metadata item containing type, code, and text"""
-        if not item or not item.type:
+            item_type (bytes): Hex-encoded four character type
+            code (bytes): Hex-encoded four character code
+            data (bytes): Base64 payload, or None if the item has none"""
+        key = (bytes.fromhex(item_type.decode('ascii')).decode('latin-1'),
+               bytes.fromhex(code.decode('ascii')).decode('latin-1'))
+        handler = self._meta_dispatch.get(key)
+        if not handler:
             return
+        text = ""
+        if data:
+            try:
+                text = base64.b64decode(data).decode('utf-8', 'replace')
+            except binascii.Error:
+                self.logger.debug(f"Skipping undecodable {key[0]}/{key[1]} data")
+                return
+        handler(text)
+        
+    def _on_metadata_end(self, text):
+        """Show the track info once a metadata bundle is complete, so a track
+        change's album, artist and title items update the display once, even
+        when they arrive over several reads."""
+        if self._pending_update:
+            self._pending_update = False
+            self._update_display()
             
-        if item.type == 'ssnc' and item.code == 'pend':
-            self.logger.debug("AirPlay playback ended")
-            self.current_track = None
-            if self.display_thread and self.display_thread.is_alive():
-                self.display_thread.cancel()
-        elif item.type == 'core':
-            if item.code == 'asal':  # Album name
-                self.current_track = self.current_track or {}
-                self.current_track['album'] = item.text
-                self.logger.debug(f"Received album metadata: {item.text}")
-            elif item.code == 'asar':  # Artist name
-                self.current_track = self.current_track or {}
-                self.current_track['artist'] = item.text
-                self.logger.debug(f"Received artist metadata: {item.text}")
-            elif item.code == 'minm':  # Track title
-                self.current_track = self.current_track or {}
-                self.current_track['title'] = item.text
-                self.logger.debug(f"Received title metadata: {item.text}")
-                self._update_display()
-                
+    def _on_playback_end(self, text):
+        """Forget the current track when AirPlay playback ends."""
+        self.logger.debug("AirPlay playback ended")
+        self.current_track = None
+        self._pending_update = False
+        
+    def _set_album(self, text):
+        """Record the album name of the current track."""
+        self.current_track = self.current_track or {}
+        self.current_track['album'] = text
+        self.logger.debug(f"Received album metadata: {text}")
+        
+    def _set_artist(self, text):
+        """Record the artist name of the current track."""
+        self.current_track = self.current_track or {}
+        self.current_track['artist'] = text
+        self.logger.debug(f"Received artist metadata: {text}")
+        
+    def _set_title(self, text):
+        """Record the title of the current track and flag the track info
+        to be shown."""
+        self.current_track = self.current_track or {}
+        self.current_track['title'] = text
+        self.logger.debug(f"Received title metadata: {text}")
+        self._pending_update = True
+        
     def _update_display(self):
         """Update the OLED display with current track information."""
         if not self.oled_manager or not self.current_track:
@@ -86,21 +202,3 @@ class ShairportManager:
             
         self.logger.info(f"Now playing: {line1.strip()} - {line2}")
         self.oled_manager.show_centered_text(line1, line2, duration=self.show_duration)
-        
-    def _read_metadata(self):
-        """Background thread function that reads metadata from Shairport pipe.
-        Continuously reads and processes metadata while running is True."""
-        while self.running:
-            try:
-                self.reader = MetadataReader(self.pipe_path)
-                self.logger.debug("Connected to Shairport metadata pipe")
-                for item in self.reader.items():
-                    if not self.running:
-                        break
-                    self._handle_metadata(item)
-            except FileNotFoundError:
-                self.logger.warning(f"Metadata pipe not found: {self.pipe_path}")
-                time.sleep(5)
-            except Exception as e:
-                self.logger.error(f"Error reading Shairport metadata: {e}")
-                time.sleep(5)  # Wait before retrying
\ No newline at end of file